@@ -1,515 +1,653 @@
 import os
+import atexit
 import logging
-from flask import Flask, render_template, request, jsonify
-from memory_manager import MemoryManager
+import logging.handlers
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+import fastjsonschema
+import orjson
+from flask import Flask, render_template, request, jsonify, session
+from flask.json.provider import JSONProvider
+from werkzeug.exceptions import HTTPException
+from memory_manager import MemoryManager, NoAllocatedMemoryError
 from tutorial_manager import TutorialManager
 
 # Configure logging
-logging.basicConfig(filename="app.log", level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s")
+# Records are queued on the request thread and written to app.log by a background listener
+_log_file_handler = logging.FileHandler("app.log")
+_log_file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+_log_queue = queue.Queue(maxsize=10000)
+_root_logger = logging.getLogger()
+_root_logger.handlers.clear()
+_root_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_root_logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_file_handler, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+def _orjson_default(obj):
+    """Serialize types orjson does not handle natively"""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _orjson_dumps(obj):
+    """Serialize an object to JSON bytes"""
+    # Page tables are keyed by integer process IDs
+    return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson for faster (de)serialization of state payloads"""
+
+    def dumps(self, obj, **kwargs):
+        return _orjson_dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(_orjson_dumps(obj), mimetype='application/json')
 
 # Create Flask app
 app = Flask(__name__, static_folder="static", template_folder="templates")
+app.json = OrjsonProvider(app)
 app.secret_key = os.environ.get("SESSION_SECRET", "memory-visualizer-secret")
 
-# Global instances
-memory_manager = None
-tutorial_manager = TutorialManager()
-if __name__ == "__main__":
-    app.run(debug=True, host="127.0.0.1", port=5000)
+# Shared instances
+# memory_managers maps browser session IDs to simulations, least recently used first
+app.extensions['tutorial_manager'] = TutorialManager()
+app.extensions['memory_managers'] = OrderedDict()
+_MAX_SESSIONS = int(os.environ.get("MAX_SESSIONS", 256))
+_sessions_lock = threading.Lock()
+
+def _get_memory_manager():
+    """Return the current session's memory manager, or None if it has no simulation"""
+    sid = session.get('sid')
+    if sid is None:
+        return None
+    sessions = app.extensions['memory_managers']
+    with _sessions_lock:
+        memory_manager = sessions.get(sid)
+        if memory_manager is not None:
+            sessions.move_to_end(sid)
+    return memory_manager
+
+def _set_memory_manager(memory_manager):
+    """Set the current session's memory manager (None ends its simulation)"""
+    sid = session.setdefault('sid', uuid.uuid4().hex)
+    sessions = app.extensions['memory_managers']
+    with _sessions_lock:
+        if memory_manager is None:
+            sessions.pop(sid, None)
+            return
+        sessions[sid] = memory_manager
+        sessions.move_to_end(sid)
+        # Evict the least recently used simulations beyond the limit
+        while len(sessions) > _MAX_SESSIONS:
+            sessions.popitem(last=False)
+
+# Simulation parameters used when a tutorial step config leaves them out
+_MM_DEFAULTS = {'technique': 'paging', 'memory_size': 1024, 'page_size': 64, 'algorithm': 'FIFO'}
+
+def _mm_from_config(config, current=None):
+    """Create a memory manager from a tutorial step config, reusing current if its settings already match"""
+    settings = {**_MM_DEFAULTS, **config}
+    if current is not None and all(getattr(current, name) == value for name, value in settings.items()):
+        return current
+    return MemoryManager(**settings)
+
+# Compiled once at import; fills in defaults for omitted parameters
+_validate_simulation_params = fastjsonschema.compile({
+    'type': 'object',
+    'properties': {
+        'technique': {'enum': ['paging', 'segmentation'], 'default': 'paging'},
+        'memory_size': {'type': 'integer', 'minimum': 1, 'maximum': 4096, 'default': 1024},
+        'page_size': {'type': 'integer', 'minimum': 1, 'maximum': 512, 'default': 64},
+        'algorithm': {'enum': ['FIFO', 'LRU'], 'default': 'FIFO'}
+    }
+})
+
+def _read_json_body():
+    """Parse the request body as JSON; return None if it is empty or malformed"""
+    # cache=False: the raw bytes are not needed again once parsed
+    body = request.get_data(cache=False)
+    if not body:
+        return None
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return None
+
+def _normalize_operation_data(operation_data):
+    """Copy tutorial operation data with size and address coerced to int; return None if they can't be"""
+    if not isinstance(operation_data, dict):
+        return None
+    normalized = dict(operation_data)
+    for key in ('size', 'address'):
+        value = normalized.get(key)
+        if value is not None and type(value) is not int:
+            try:
+                normalized[key] = int(value)
+            except (ValueError, TypeError):
+                return None
+    return normalized
+
+# Bodies of constant responses, serialized once at import
+_RESET_OK_BODY = _orjson_dumps({
+    'status': 'success',
+    'message': 'Simulation reset successfully'
+})
+_NO_SIMULATION_BODY = _orjson_dumps({
+    'status': 'error',
+    'message': 'No active simulation. Please start a simulation first.'
+})
+
+def _json_bytes_response(body, status=200):
+    """Wrap already serialized JSON bytes in a response"""
+    # A new response object each time: Flask may set the session cookie on it
+    return app.response_class(body, status=status, mimetype='application/json')
+
+# Distinguishes entity tags issued by this process: state versions restart at 1
+_ETAG_PREFIX = uuid.uuid4().hex[:8]
+
+def _tag_response(response, etag):
+    """Attach an entity tag, asking clients to revalidate before reusing the response"""
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
+def _not_modified(etag):
+    """Build a 304 response for a client that already has the tagged entity"""
+    return _tag_response(app.response_class(status=304), etag)
+
+# Serialized state responses keyed by (endpoint, state version), least recently used first
+_STATE_CACHE_SIZE = 8
+_state_cache = OrderedDict()
+_state_cache_lock = threading.Lock()
+
+def _cached_state_response(endpoint, memory_manager, build_payload):
+    """Return a JSON response for a memory manager's state, serializing it once per state version"""
+    key = (endpoint, memory_manager.version)
+    with _state_cache_lock:
+        body = _state_cache.get(key)
+        if body is not None:
+            _state_cache.move_to_end(key)
+    if body is None:
+        body = _orjson_dumps(build_payload())
+        with _state_cache_lock:
+            _state_cache[key] = body
+            if len(_state_cache) > _STATE_CACHE_SIZE:
+                _state_cache.popitem(last=False)
+    return _json_bytes_response(body)
+
+# Rendered HTML for pages without per-request content, keyed by template name
+_rendered_pages = {}
+
+def _render_page(template_name):
+    """Render a page template once and serve the cached bytes afterwards"""
+    body = _rendered_pages.get(template_name)
+    if body is None:
+        body = render_template(template_name).encode('utf-8')
+        # Re-render on every request in debug mode so template edits show up
+        if not app.debug:
+            _rendered_pages[template_name] = body
+    return app.response_class(body, mimetype='text/html')
+
+@app.errorhandler(Exception)
+def handle_unexpected_error(e):
+    """Return a JSON error response for exceptions not handled by a route"""
+    if isinstance(e, HTTPException):
+        return e
+    
+    logging.exception(f"Unexpected error in {request.path}: {str(e)}")
+    return jsonify({
+        'status': 'error',
+        'message': f'Server error: {str(e)}'
+    }), 500
 
 @app.route('/')
 def index():
     """Render the landing page"""
-    return render_template('index.html')
+    return _render_page('index.html')
 
 @app.route('/dashboard')
 def dashboard():
     """Render the simulation dashboard"""
-    return render_template('dashboard.html')
+    return _render_page('dashboard.html')
 
 @app.route('/api/start_simulation', methods=['POST'])
 def start_simulation():
     """Initialize the memory simulation with user parameters"""
-    global memory_manager
+    # Validate request
+    data = _read_json_body()
+    if data is None:
+        logging.error("Invalid request format: not JSON")
+        return jsonify({
+            'status': 'error',
+            'message': 'Invalid request format. Expected JSON.'
+        }), 400
     
+    # Extract and validate parameters (schema errors are ValueErrors)
     try:
-        # Validate request
-        if not request.is_json:
-            logging.error("Invalid request format: not JSON")
-            return jsonify({
-                'status': 'error',
-                'message': 'Invalid request format. Expected JSON.'
-            }), 400
+        params = _validate_simulation_params(data)
+        technique = params['technique']
+        # The schema accepts integral floats such as 64.0
+        memory_size = int(params['memory_size'])
+        page_size = int(params['page_size'])
+        algorithm = params['algorithm']
         
-        data = request.json
+        # Validate that memory size is a multiple of page size
+        if memory_size % page_size != 0:
+            raise ValueError("Memory size must be a multiple of page size")
+        
+    except ValueError as e:
+        logging.error(f"Parameter validation error: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f"Parameter validation error: {str(e)}"
+        }), 400
+    
+    # Initialize memory manager
+    try:
+        memory_manager = MemoryManager(
+            technique=technique,
+            memory_size=memory_size,
+            page_size=page_size,
+            algorithm=algorithm
+        )
+        _set_memory_manager(memory_manager)
+        
+        initial_state = memory_manager.get_current_state()
+        
+        # Log success
+        logging.info(f"Simulation started with: technique={technique}, memory_size={memory_size}, page_size={page_size}, algorithm={algorithm}")
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Simulation started successfully',
+            'initial_state': initial_state
+        })
         
-        # Extract and validate parameters
+    except Exception as e:
+        logging.error(f"Error initializing memory manager: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f"Error initializing simulation: {str(e)}"
+        }), 500
+
+# Most operations a single batch request may apply
+_MAX_BATCH_OPS = 1024
+
+def _apply_operation(memory_manager, data):
+    """Apply one memory operation request; return an error message, or None on success"""
+    operation = data.get('operation')
+    if not operation:
+        operation = 'allocate'
+        logging.warning(f"No operation specified, defaulting to '{operation}'")
+    
+    if operation == 'allocate':
         try:
-            technique = data.get('technique', 'paging')
-            if technique not in ['paging', 'segmentation']:
-                raise ValueError(f"Invalid technique: {technique}")
-            
-            memory_size = int(data.get('memory_size', 1024))
-            if memory_size <= 0 or memory_size > 4096:
-                raise ValueError(f"Invalid memory size: {memory_size}")
-            
-            page_size = int(data.get('page_size', 64))
-            if page_size <= 0 or page_size > 512:
-                raise ValueError(f"Invalid page size: {page_size}")
+            size = data.get('size')
+            if size is None:
+                size = 64
+                logging.warning(f"No size specified for allocation, using default: {size}")
+            else:
+                size = int(size)
+                if size <= 0:
+                    size = 64
+                    logging.warning(f"Invalid allocation size, using default: {size}")
             
-            algorithm = data.get('algorithm', 'FIFO')
-            if algorithm not in ['FIFO', 'LRU']:
-                raise ValueError(f"Invalid algorithm: {algorithm}")
+            memory_manager.allocate_memory(size)
+            logging.debug("Successfully allocated %d bytes", size)
             
-            # Validate that memory size is a multiple of page size
-            if memory_size % page_size != 0:
-                raise ValueError("Memory size must be a multiple of page size")
+        except (ValueError, TypeError) as e:
+            logging.error(f"Error parsing allocation size: {e}")
+            return f'Invalid allocation size: {str(e)}'
             
-        except ValueError as e:
-            logging.error(f"Parameter validation error: {str(e)}")
-            return jsonify({
-                'status': 'error',
-                'message': f"Parameter validation error: {str(e)}"
-            }), 400
-        
-        # Initialize memory manager
+    elif operation == 'deallocate':
         try:
-            memory_manager = MemoryManager(
-                technique=technique,
-                memory_size=memory_size,
-                page_size=page_size,
-                algorithm=algorithm
-            )
+            address = data.get('address')
+            if address is None:
+                # Use the first allocated frame
+                address = memory_manager.deallocate_first_allocated()
+                logging.warning(f"No address specified for deallocation, used first allocated frame: {address}")
+            else:
+                try:
+                    address = int(address)
+                except (ValueError, TypeError):
+                    # Use the first allocated frame if the provided address is invalid
+                    address = memory_manager.deallocate_first_allocated()
+                    logging.warning(f"Invalid address for deallocation, used first allocated frame: {address}")
+                else:
+                    memory_manager.deallocate_memory(address)
             
-            initial_state = memory_manager.get_current_state()
+            logging.debug("Successfully deallocated memory at address %s", address)
             
-            # Log success
-            logging.info(f"Simulation started with: technique={technique}, memory_size={memory_size}, page_size={page_size}, algorithm={algorithm}")
+        except NoAllocatedMemoryError:
+            return 'No memory allocated to deallocate'
+        except Exception as e:
+            logging.error(f"Error in deallocation: {e}")
+            return f'Deallocation error: {str(e)}'
             
-            return jsonify({
-                'status': 'success',
-                'message': 'Simulation started successfully',
-                'initial_state': initial_state
-            })
+    elif operation == 'access':
+        try:
+            address = data.get('address')
+            if address is None:
+                # Use a default or find a valid address
+                address = 0
+                logging.warning(f"No address specified for memory access, using default: {address}")
+            else:
+                try:
+                    address = int(address)
+                except (ValueError, TypeError):
+                    address = 0
+                    logging.warning(f"Invalid address for memory access, using default: {address}")
+            
+            memory_manager.access_memory(address)
+            logging.debug("Successfully accessed memory at address %s", address)
             
         except Exception as e:
-            logging.error(f"Error initializing memory manager: {str(e)}")
-            return jsonify({
-                'status': 'error',
-                'message': f"Error initializing simulation: {str(e)}"
-            }), 500
+            logging.error(f"Error in memory access: {e}")
+            return f'Memory access error: {str(e)}'
             
-    except Exception as e:
-        logging.error(f"Unexpected error in start_simulation: {str(e)}")
-        return jsonify({
-            'status': 'error',
-            'message': 'An unexpected error occurred'
-        }), 500
+    else:
+        return f'Unknown operation: {operation}'
+    
+    return None
 
 @app.route('/api/next_step', methods=['POST'])
 def next_step():
     """Process the next memory operation and return the updated state"""
-    global memory_manager
+    memory_manager = _get_memory_manager()
     
     if not memory_manager:
+        return _json_bytes_response(_NO_SIMULATION_BODY, 400)
+    
+    data = _read_json_body()
+    if not data:
         return jsonify({
             'status': 'error',
-            'message': 'No active simulation. Please start a simulation first.'
+            'message': 'Invalid request: No JSON data provided'
         }), 400
-    
-    try:
-        data = request.json
-        if not data:
+        
+    if data.get('operation') == 'batch':
+        # Apply several operations and return a single state snapshot
+        operations = data.get('ops')
+        if not isinstance(operations, list):
             return jsonify({
                 'status': 'error',
-                'message': 'Invalid request: No JSON data provided'
+                'message': "Batch requests require an 'ops' list"
+            }), 400
+        if len(operations) > _MAX_BATCH_OPS:
+            return jsonify({
+                'status': 'error',
+                'message': f'Batch requests may contain at most {_MAX_BATCH_OPS} operations'
             }), 400
-            
-        operation = data.get('operation')
-        if not operation:
-            operation = 'allocate'
-            logging.warning(f"No operation specified, defaulting to '{operation}'")
         
-        # Validation and execution
-        if operation == 'allocate':
-            try:
-                size = data.get('size')
-                if size is None:
-                    size = 64
-                    logging.warning(f"No size specified for allocation, using default: {size}")
-                else:
-                    size = int(size)
-                    if size <= 0:
-                        size = 64
-                        logging.warning(f"Invalid allocation size, using default: {size}")
-                
-                memory_manager.allocate_memory(size)
-                logging.debug(f"Successfully allocated {size} bytes")
-                
-            except (ValueError, TypeError) as e:
-                logging.error(f"Error parsing allocation size: {e}")
+        # Bound locally: this loop runs once per operation in the batch
+        apply_operation = _apply_operation
+        for index, operation_data in enumerate(operations):
+            if not isinstance(operation_data, dict):
+                error = 'Operation must be a JSON object'
+            else:
+                error = apply_operation(memory_manager, operation_data)
+            if error:
                 return jsonify({
                     'status': 'error',
-                    'message': f'Invalid allocation size: {str(e)}'
+                    'message': f'Operation {index}: {error}'
                 }), 400
-                
-        elif operation == 'deallocate':
-            try:
-                address = data.get('address')
-                if address is None:
-                    # Find the first allocated frame
-                    for i, frame in enumerate(memory_manager.memory):
-                        if frame['status'] == 'allocated':
-                            address = i * memory_manager.page_size
-                            logging.warning(f"No address specified for deallocation, using first allocated frame: {address}")
-                            break
-                    else:
-                        return jsonify({
-                            'status': 'error',
-                            'message': 'No memory allocated to deallocate'
-                        }), 400
-                else:
-                    try:
-                        address = int(address)
-                    except (ValueError, TypeError):
-                        # Find a valid address if the provided one is invalid
-                        for i, frame in enumerate(memory_manager.memory):
-                            if frame['status'] == 'allocated':
-                                address = i * memory_manager.page_size
-                                logging.warning(f"Invalid address for deallocation, using first allocated frame: {address}")
-                                break
-                        else:
-                            return jsonify({
-                                'status': 'error',
-                                'message': 'No memory allocated to deallocate'
-                            }), 400
-                
-                memory_manager.deallocate_memory(address)
-                logging.debug(f"Successfully deallocated memory at address {address}")
-                
-            except Exception as e:
-                logging.error(f"Error in deallocation: {e}")
-                return jsonify({
-                    'status': 'error',
-                    'message': f'Deallocation error: {str(e)}'
-                }), 400
-                
-        elif operation == 'access':
-            try:
-                address = data.get('address')
-                if address is None:
-                    # Use a default or find a valid address
-                    address = 0
-                    logging.warning(f"No address specified for memory access, using default: {address}")
-                else:
-                    try:
-                        address = int(address)
-                    except (ValueError, TypeError):
-                        address = 0
-                        logging.warning(f"Invalid address for memory access, using default: {address}")
-                
-                memory_manager.access_memory(address)
-                logging.debug(f"Successfully accessed memory at address {address}")
-                
-            except Exception as e:
-                logging.error(f"Error in memory access: {e}")
-                return jsonify({
-                    'status': 'error',
-                    'message': f'Memory access error: {str(e)}'
-                }), 400
-                
-        else:
+    else:
+        error = _apply_operation(memory_manager, data)
+        if error:
             return jsonify({
                 'status': 'error',
-                'message': f'Unknown operation: {operation}'
+                'message': error
             }), 400
-        
-        # Get and return the new state
-        try:
-            new_state = memory_manager.get_current_state()
-            
-            return jsonify({
-                'status': 'success',
-                'state': new_state
-            })
-        except Exception as e:
-            logging.error(f"Error getting memory state: {e}")
-            return jsonify({
-                'status': 'error',
-                'message': f'Failed to get memory state: {str(e)}'
-            }), 500
-            
+    
+    # Get and return the new state
+    try:
+        return _cached_state_response('next_step', memory_manager, lambda: {
+            'status': 'success',
+            'state': memory_manager.get_current_state()
+        })
     except Exception as e:
-        logging.error(f"Unexpected error in next_step: {str(e)}")
+        logging.error(f"Error getting memory state: {e}")
         return jsonify({
             'status': 'error',
-            'message': f'Server error: {str(e)}'
+            'message': f'Failed to get memory state: {str(e)}'
         }), 500
 
 @app.route('/api/get_results', methods=['GET'])
 def get_results():
     """Return the current simulation results and analytics"""
-    global memory_manager
+    memory_manager = _get_memory_manager()
     
     if not memory_manager:
-        return jsonify({
-            'status': 'error',
-            'message': 'No active simulation. Please start a simulation first.'
-        }), 400
+        return _json_bytes_response(_NO_SIMULATION_BODY, 400)
     
-    results = memory_manager.get_results()
+    etag = f'{_ETAG_PREFIX}-{memory_manager.version}'
+    if etag in request.if_none_match:
+        return _not_modified(etag)
     
-    return jsonify({
+    response = _cached_state_response('get_results', memory_manager, lambda: {
         'status': 'success',
-        'results': results
+        'results': memory_manager.get_results()
     })
+    return _tag_response(response, etag)
 
 @app.route('/api/reset_simulation', methods=['POST'])
 def reset_simulation():
     """Reset the current simulation"""
-    global memory_manager
-    
-    memory_manager = None
+    _set_memory_manager(None)
     
-    return jsonify({
-        'status': 'success',
-        'message': 'Simulation reset successfully'
-    })
+    return _json_bytes_response(_RESET_OK_BODY)
 
 # Tutorial API Routes
 @app.route('/tutorials')
 def tutorials_page():
     """Render the tutorials page"""
-    return render_template('tutorials.html')
+    return _render_page('tutorials.html')
 
 @app.route('/api/tutorials', methods=['GET'])
 def get_tutorials():
     """Get list of available tutorials"""
-    global tutorial_manager
+    tutorial_manager = app.extensions['tutorial_manager']
+    
+    etag = tutorial_manager.get_tutorial_list_etag()
+    if etag in request.if_none_match:
+        return _not_modified(etag)
     
     tutorials = tutorial_manager.get_tutorial_list()
     
-    return jsonify({
+    response = jsonify({
         'status': 'success',
         'tutorials': tutorials
     })
+    return _tag_response(response, etag)
 
 @app.route('/api/tutorials/start', methods=['POST'])
 def start_tutorial():
     """Start a specific tutorial"""
-    global tutorial_manager, memory_manager
+    tutorial_manager = app.extensions['tutorial_manager']
     
-    try:
-        data = request.json
+    data = _read_json_body()
+    
+    if not data or 'tutorial_id' not in data:
+        return jsonify({
+            'status': 'error',
+            'message': 'Tutorial ID is required'
+        }), 400
         
-        if not data or 'tutorial_id' not in data:
-            return jsonify({
-                'status': 'error',
-                'message': 'Tutorial ID is required'
-            }), 400
-            
-        tutorial_id = data['tutorial_id']
+    tutorial_id = data['tutorial_id']
+    
+    # Start the tutorial
+    step_data = tutorial_manager.start_tutorial(tutorial_id)
+    
+    if 'error' in step_data and step_data['error']:
+        return jsonify({
+            'status': 'error',
+            'message': step_data['message']
+        }), 404
         
-        # Start the tutorial
-        step_data = tutorial_manager.start_tutorial(tutorial_id)
+    # Create a memory manager with the tutorial's initial configuration if needed
+    if 'step' in step_data and 'config' in step_data['step'] and step_data['step']['config']:
+        config = step_data['step']['config']
         
-        if 'error' in step_data and step_data['error']:
-            return jsonify({
-                'status': 'error',
-                'message': step_data['message']
-            }), 404
+        if 'memory_size' in config and 'page_size' in config:
+            memory_manager = _mm_from_config(config)
+            _set_memory_manager(memory_manager)
             
-        # Create a memory manager with the tutorial's initial configuration if needed
-        if 'step' in step_data and 'config' in step_data['step'] and step_data['step']['config']:
-            config = step_data['step']['config']
+            logging.info(f"Tutorial memory manager initialized with config: {config}")
             
-            if 'memory_size' in config and 'page_size' in config:
-                memory_manager = MemoryManager(
-                    technique=config.get('technique', 'paging'),
-                    memory_size=config.get('memory_size', 1024),
-                    page_size=config.get('page_size', 64),
-                    algorithm=config.get('algorithm', 'FIFO')
-                )
-                
-                logging.info(f"Tutorial memory manager initialized with config: {config}")
-                
-                # Add the memory state to the step data
-                step_data['memory_state'] = memory_manager.get_current_state()
-        
-        return jsonify({
-            'status': 'success',
-            'tutorial_step': step_data
-        })
+            # Add the memory state to a copy of the (shared) step data
+            step_data = {**step_data, 'memory_state': memory_manager.get_current_state()}
     
-    except Exception as e:
-        logging.error(f"Error starting tutorial: {str(e)}")
-        return jsonify({
-            'status': 'error',
-            'message': f'Failed to start tutorial: {str(e)}'
-        }), 500
+    return jsonify({
+        'status': 'success',
+        'tutorial_step': step_data
+    })
 
 @app.route('/api/tutorials/next', methods=['POST'])
 def tutorial_next_step():
     """Advance to the next step in the tutorial"""
-    global tutorial_manager, memory_manager
+    tutorial_manager = app.extensions['tutorial_manager']
     
-    try:
-        # Check if an operation was performed (for verification)
-        data = request.json or {}
-        operation_data = data.get('operation_data', {})
-        
-        # Verify step if operation data provided
-        if operation_data:
-            if not tutorial_manager.verify_step_completed(operation_data):
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Please complete the current step\'s task before proceeding'
-                }), 400
-        
-        # Advance to next step
-        step_data = tutorial_manager.next_step()
-        
-        if 'error' in step_data and step_data['error']:
+    # Check if an operation was performed (for verification)
+    data = _read_json_body() or {}
+    operation_data = data.get('operation_data', {})
+    
+    # Verify step if operation data provided
+    if operation_data:
+        operation_data = _normalize_operation_data(operation_data)
+        if operation_data is None:
             return jsonify({
                 'status': 'error',
-                'message': step_data['message']
+                'message': 'Invalid operation data: size and address must be integers'
             }), 400
-            
-        # If tutorial completed
-        if 'completed' in step_data and step_data['completed']:
+        
+        if not tutorial_manager.verify_step_completed(operation_data):
             return jsonify({
-                'status': 'success',
-                'completed': True,
-                'message': step_data['message']
-            })
-            
-        # Initialize memory manager with step config if needed
-        if 'step' in step_data and 'config' in step_data['step'] and step_data['step']['config']:
-            config = step_data['step']['config']
-            
-            if config and 'technique' in config:
-                memory_manager = MemoryManager(
-                    technique=config.get('technique', 'paging'),
-                    memory_size=config.get('memory_size', 1024),
-                    page_size=config.get('page_size', 64),
-                    algorithm=config.get('algorithm', 'FIFO')
-                )
-                
-                logging.info(f"Tutorial step memory manager initialized with config: {config}")
-                
-                # Add the memory state to the step data
-                step_data['memory_state'] = memory_manager.get_current_state()
+                'status': 'error',
+                'message': 'Please complete the current step\'s task before proceeding'
+            }), 400
+    
+    # Advance to next step
+    step_data = tutorial_manager.next_step()
+    
+    if 'error' in step_data and step_data['error']:
+        return jsonify({
+            'status': 'error',
+            'message': step_data['message']
+        }), 400
         
+    # If tutorial completed
+    if 'completed' in step_data and step_data['completed']:
         return jsonify({
             'status': 'success',
-            'tutorial_step': step_data
+            'completed': True,
+            'message': step_data['message']
         })
+        
+    # Initialize memory manager with step config if needed
+    if 'step' in step_data and 'config' in step_data['step'] and step_data['step']['config']:
+        config = step_data['step']['config']
+        
+        if config and 'technique' in config:
+            current_manager = _get_memory_manager()
+            memory_manager = _mm_from_config(config, current_manager)
+            if memory_manager is not current_manager:
+                _set_memory_manager(memory_manager)
+                logging.info(f"Tutorial step memory manager initialized with config: {config}")
+            
+            # Add the memory state to a copy of the (shared) step data
+            step_data = {**step_data, 'memory_state': memory_manager.get_current_state()}
     
-    except Exception as e:
-        logging.error(f"Error advancing tutorial: {str(e)}")
-        return jsonify({
-            'status': 'error',
-            'message': f'Failed to advance tutorial: {str(e)}'
-        }), 500
+    return jsonify({
+        'status': 'success',
+        'tutorial_step': step_data
+    })
 
 @app.route('/api/tutorials/previous', methods=['POST'])
 def tutorial_previous_step():
     """Go back to the previous step in the tutorial"""
-    global tutorial_manager, memory_manager
+    tutorial_manager = app.extensions['tutorial_manager']
     
-    try:
-        step_data = tutorial_manager.previous_step()
-        
-        if 'error' in step_data and step_data['error']:
-            return jsonify({
-                'status': 'error',
-                'message': step_data['message']
-            }), 400
-            
-        # Initialize memory manager with step config if needed
-        if 'step' in step_data and 'config' in step_data['step'] and step_data['step']['config']:
-            config = step_data['step']['config']
-            
-            if config and ('memory_size' in config or 'technique' in config):
-                memory_manager = MemoryManager(
-                    technique=config.get('technique', 'paging'),
-                    memory_size=config.get('memory_size', 1024),
-                    page_size=config.get('page_size', 64),
-                    algorithm=config.get('algorithm', 'FIFO')
-                )
-                
-                logging.info(f"Tutorial step memory manager initialized with config: {config}")
-                
-                # Add the memory state to the step data
-                step_data['memory_state'] = memory_manager.get_current_state()
-        
-        return jsonify({
-            'status': 'success',
-            'tutorial_step': step_data
-        })
-        
-    except Exception as e:
-        logging.error(f"Error going to previous tutorial step: {str(e)}")
+    step_data = tutorial_manager.previous_step()
+    
+    if 'error' in step_data and step_data['error']:
         return jsonify({
             'status': 'error',
-            'message': f'Failed to go to previous step: {str(e)}'
-        }), 500
+            'message': step_data['message']
+        }), 400
+        
+    # Initialize memory manager with step config if needed
+    if 'step' in step_data and 'config' in step_data['step'] and step_data['step']['config']:
+        config = step_data['step']['config']
+        
+        if config and ('memory_size' in config or 'technique' in config):
+            current_manager = _get_memory_manager()
+            memory_manager = _mm_from_config(config, current_manager)
+            if memory_manager is not current_manager:
+                _set_memory_manager(memory_manager)
+                logging.info(f"Tutorial step memory manager initialized with config: {config}")
+            
+            # Add the memory state to a copy of the (shared) step data
+            step_data = {**step_data, 'memory_state': memory_manager.get_current_state()}
+    
+    return jsonify({
+        'status': 'success',
+        'tutorial_step': step_data
+    })
 
 @app.route('/api/tutorials/end', methods=['POST'])
 def end_tutorial():
     """End the current tutorial"""
-    global tutorial_manager
+    tutorial_manager = app.extensions['tutorial_manager']
     
-    try:
-        result = tutorial_manager.end_tutorial()
-        
-        if 'error' in result and result['error']:
-            return jsonify({
-                'status': 'error',
-                'message': result['message']
-            }), 400
-            
-        return jsonify({
-            'status': 'success',
-            'message': 'Tutorial ended successfully',
-            'tutorial_id': result.get('tutorial_id')
-        })
-        
-    except Exception as e:
-        logging.error(f"Error ending tutorial: {str(e)}")
+    result = tutorial_manager.end_tutorial()
+    
+    if 'error' in result and result['error']:
         return jsonify({
             'status': 'error',
-            'message': f'Failed to end tutorial: {str(e)}'
-        }), 500
+            'message': result['message']
+        }), 400
+        
+    return jsonify({
+        'status': 'success',
+        'message': 'Tutorial ended successfully',
+        'tutorial_id': result.get('tutorial_id')
+    })
 
 @app.route('/api/tutorials/current', methods=['GET'])
 def get_current_tutorial_step():
     """Get the current tutorial step"""
-    global tutorial_manager, memory_manager
+    tutorial_manager = app.extensions['tutorial_manager']
+    memory_manager = _get_memory_manager()
     
-    try:
-        step_data = tutorial_manager.get_current_step()
-        
-        if 'error' in step_data and step_data['error']:
-            return jsonify({
-                'status': 'error',
-                'message': step_data['message']
-            }), 400
-        
-        # Add current memory state if available
-        if memory_manager:
-            step_data['memory_state'] = memory_manager.get_current_state()
-        
-        return jsonify({
-            'status': 'success',
-            'tutorial_step': step_data
-        })
-        
-    except Exception as e:
-        logging.error(f"Error getting current tutorial step: {str(e)}")
+    step_data = tutorial_manager.get_current_step()
+    
+    if 'error' in step_data and step_data['error']:
         return jsonify({
             'status': 'error',
-            'message': f'Failed to get tutorial step: {str(e)}'
-        }), 500
+            'message': step_data['message']
+        }), 400
+    
+    # Add current memory state to a copy of the (shared) step data if available
+    if memory_manager:
+        step_data = {**step_data, 'memory_state': memory_manager.get_current_state()}
+    
+    return jsonify({
+        'status': 'success',
+        'tutorial_step': step_data
+    })
+
 if __name__ == "__main__":
-    app.run(debug=True, host="127.0.0.1", port=5000)
\ No newline at end of file
+    app.run(debug=os.environ.get("FLASK_DEBUG") == "1", host="127.0.0.1", port=5000)
\ No newline at end of file
@@ -1,4 +1,5 @@
+import os
 from app import app
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    app.run(debug=os.environ.get("FLASK_DEBUG") == "1")
@@ -1,6 +1,29 @@
 import random
 import logging
-from collections import deque
+import itertools
+from array import array
+from collections import OrderedDict, deque, namedtuple
+from sortedcontainers import SortedList
+
+# State versions come from one shared counter, so a version number identifies
+# a single state of a single manager
+_state_versions = itertools.count(1)
+
+# Owner ID stored for frames that are not allocated
+FREE_FRAME = -1
+
+# Number of most recent operations kept in the operation history
+OPERATION_HISTORY_SIZE = 1024
+
+logger = logging.getLogger(__name__)
+
+# Operation history records, converted to dicts when the state is read
+AllocateRecord = namedtuple('AllocateRecord', 'type process_id size frames')
+DeallocateRecord = namedtuple('DeallocateRecord', 'type process_id address frames')
+AccessRecord = namedtuple('AccessRecord', 'type address result')
+
+class NoAllocatedMemoryError(ValueError):
+    """Raised when an operation needs allocated memory but none is allocated"""
 
 class MemoryManager:
     """Class to manage memory allocation and tracking for visualization"""
@@ -23,32 +46,53 @@ class MemoryManager:
         # Calculate total number of frames/pages
         self.total_frames = memory_size // page_size
         
+        # Shift that divides by page_size, or None when it isn't a power of two
+        self.page_shift = page_size.bit_length() - 1 if page_size & (page_size - 1) == 0 else None
+        
         # Initialize memory structures
-        self.memory = [{'status': 'free', 'id': None} for _ in range(self.total_frames)]
-        self.page_table = {}  # Maps page ID to frame number
+        # Owning process/page ID per frame, FREE_FRAME when the frame is free
+        self.frame_id = array('q', [FREE_FRAME]) * self.total_frames
+        self.page_table = {}  # Maps page ID to its set of frame numbers
+        self._allocated_frames = SortedList()  # Indices of allocated frames, lowest first
+        self._free_frames = SortedList(range(self.total_frames))  # Indices of free frames, lowest first
+        self._memory_snapshot = None  # Frame list for get_current_state, None once ownership changes
         
         # For page replacement algorithms
-        self.page_queue = deque()  # For FIFO
-        self.page_access_time = {}  # For LRU
+        # Both are keyed by frame index alone, since a frame has one owner at a time
+        self.page_queue = OrderedDict()  # For FIFO, oldest first
+        self.page_access_time = OrderedDict()  # For LRU, least recently used first
+        
+        # Replacement bookkeeping, chosen once for the algorithm. Both FIFO and
+        # LRU keep their candidates oldest first, so eviction pops the front of
+        # _replacement_order; unknown algorithms track nothing.
+        if algorithm == 'FIFO':
+            self._replacement_order = self.page_queue
+            self._on_allocate_frame = self._track_allocated_frame
+            self._on_access_hit = self._untracked_on_access_hit
+        elif algorithm == 'LRU':
+            self._replacement_order = self.page_access_time
+            self._on_allocate_frame = self._track_allocated_frame
+            self._on_access_hit = self._lru_on_access_hit
+        else:
+            self._replacement_order = None
+            self._on_allocate_frame = self._untracked_on_allocate
+            self._on_access_hit = self._untracked_on_access_hit
         
         # Performance metrics
         self.page_faults = 0
         self.memory_accesses = 0
         self.page_hits = 0
         
-        # Operation history
-        self.operations = []
+        # Operation history, bounded so long simulations don't grow without limit
+        self.operations = deque(maxlen=OPERATION_HISTORY_SIZE)
         
         # Next process/page ID (incremental)
         self.next_id = 1
         
+        # Changes whenever the memory state changes, for caching serialized state
+        self.version = next(_state_versions)
         
-        logging.basicConfig(
-        filename="memory_manager.log",
-        level=logging.DEBUG,
-        format="%(asctime)s - %(levelname)s - %(message)s"
-        )
-        logging.debug(f"Memory Manager initialized with {technique}, size: {memory_size}, page size: {page_size}, algorithm: {algorithm}")
+        logger.debug("Memory Manager initialized with %s, size: %s, page size: %s, algorithm: %s", technique, memory_size, page_size, algorithm)
 
 
     
@@ -63,48 +107,44 @@ class MemoryManager:
             int: Starting address of allocated memory
         """
         # Calculate number of pages/frames needed
-        num_pages_needed = (size + self.page_size - 1) // self.page_size
+        if self.page_shift is not None:
+            num_pages_needed = (size + self.page_size - 1) >> self.page_shift
+        else:
+            num_pages_needed = (size + self.page_size - 1) // self.page_size
         
         if num_pages_needed > self.total_frames:
             raise ValueError(f"Requested size {size} exceeds total memory size {self.memory_size}")
         
-        # Find free frames
-        free_frames = [i for i, frame in enumerate(self.memory) if frame['status'] == 'free']
-        
         # If not enough free frames, perform page replacement
-        if len(free_frames) < num_pages_needed:
-            frames_to_replace = num_pages_needed - len(free_frames)
+        if len(self._free_frames) < num_pages_needed:
+            frames_to_replace = num_pages_needed - len(self._free_frames)
             self._replace_pages(frames_to_replace)
-            # Update free frames list
-            free_frames = [i for i, frame in enumerate(self.memory) if frame['status'] == 'free']
         
         # Allocate memory
         process_id = self.next_id
         self.next_id += 1
         
-        allocated_frames = free_frames[:num_pages_needed]
+        # Take the lowest-numbered free frames
+        allocated_frames = self._free_frames[:num_pages_needed]
+        del self._free_frames[:num_pages_needed]
         
+        self._allocated_frames.update(allocated_frames)
+        if allocated_frames:
+            self.page_table[process_id] = set(allocated_frames)
+        
+        self._memory_snapshot = None
+        frame_id = self.frame_id
+        on_allocate_frame = self._on_allocate_frame
         for frame_idx in allocated_frames:
-            self.memory[frame_idx] = {
-                'status': 'allocated',
-                'id': process_id
-            }
-            self.page_table[process_id] = allocated_frames
+            frame_id[frame_idx] = process_id
             
             # Update page replacement data structures
-            if self.algorithm == 'FIFO':
-                self.page_queue.append((process_id, frame_idx))
-            elif self.algorithm == 'LRU':
-                self.page_access_time[(process_id, frame_idx)] = self.memory_accesses
-            
-        self.operations.append({
-            'type': 'allocate',
-            'process_id': process_id,
-            'size': size,
-            'frames': allocated_frames
-        })
+            on_allocate_frame(frame_idx)
+        
+        self.operations.append(AllocateRecord('allocate', process_id, size, allocated_frames))
         
-        logging.debug(f"Allocated {size} bytes ({num_pages_needed} pages) for process {process_id} in frames {allocated_frames}")
+        self.bump_version()
+        logger.debug("Allocated %s bytes (%s pages) for process %s in frames %s", size, num_pages_needed, process_id, allocated_frames)
         
         # Return the starting frame number as the "address"
         return allocated_frames[0] * self.page_size
@@ -116,76 +156,70 @@ class MemoryManager:
         Args:
             address (int): Starting address of memory to deallocate
         """
-        # Input validation
-        if address is None:
-            raise ValueError("Address cannot be None")
+        # Input validation, skipped for the usual int address
+        if type(address) is not int:
+            if address is None:
+                raise ValueError("Address cannot be None")
+            
+            try:
+                address = int(address)
+            except (ValueError, TypeError):
+                raise ValueError(f"Invalid address format: {address}")
         
-        try:
-            address = int(address)
-        except (ValueError, TypeError):
-            raise ValueError(f"Invalid address format: {address}")
+        page_size = self.page_size
+        total_frames = self.total_frames
+        page_table = self.page_table
         
         # Convert address to frame number
-        frame_num = address // self.page_size
+        page_shift = self.page_shift
+        frame_num = address >> page_shift if page_shift is not None else address // page_size
         
-        if frame_num >= len(self.memory) or frame_num < 0:
+        if frame_num >= total_frames or frame_num < 0:
             raise ValueError(f"Invalid address: {address} (frame {frame_num} out of bounds)")
         
-        frame = self.memory[frame_num]
+        process_id = self.frame_id[frame_num]
         
         # Check if the frame is allocated
-        if frame['status'] != 'allocated':
+        if process_id == FREE_FRAME:
             # Look for any allocated memory and deallocate the first one found
-            allocated_frames = [(i, f) for i, f in enumerate(self.memory) if f['status'] == 'allocated']
-            
-            if not allocated_frames:
-                raise ValueError("No allocated memory to deallocate")
+            if not self._allocated_frames:
+                raise NoAllocatedMemoryError("No allocated memory to deallocate")
             
             # Use the first allocated frame instead
-            frame_num = allocated_frames[0][0]
-            frame = allocated_frames[0][1]
-            logging.warning(f"No allocated memory at address {address}, using frame {frame_num} instead")
-        
-        process_id = frame['id']
-        if process_id is None:
-            raise ValueError(f"No process ID associated with frame {frame_num}")
+            frame_num = self._allocated_frames[0]
+            process_id = self.frame_id[frame_num]
+            logger.warning("No allocated memory at address %s, using frame %s instead", address, frame_num)
         
         # Find all frames for this process
-        process_frames = self.page_table.get(process_id, [])
+        process_frames = sorted(page_table.get(process_id, ()))
         if not process_frames:
             # Just free this single frame if we can't find its process frames
             process_frames = [frame_num]
-            logging.warning(f"No frames found for process {process_id} in page table, only freeing frame {frame_num}")
+            logger.warning("No frames found for process %s in page table, only freeing frame %s", process_id, frame_num)
         
         # Free all frames
+        release_frame = self._release_frame
         for frame_idx in process_frames:
-            if 0 <= frame_idx < len(self.memory):  # Safety check
-                self.memory[frame_idx] = {'status': 'free', 'id': None}
-                
-                # Remove from page replacement data structures
-                if self.algorithm == 'FIFO':
-                    self.page_queue = deque([p for p in self.page_queue if p[0] != process_id])
-                elif self.algorithm == 'LRU':
-                    keys_to_remove = [(pid, fidx) for (pid, fidx) in self.page_access_time.keys() if pid == process_id]
-                    for key in keys_to_remove:
-                        if key in self.page_access_time:
-                            del self.page_access_time[key]
+            if 0 <= frame_idx < total_frames:  # Safety check
+                release_frame(frame_idx)
+        
+        # Remove from page replacement data structures
+        replacement_order = self._replacement_order
+        if replacement_order is not None:
+            for frame_idx in process_frames:
+                replacement_order.pop(frame_idx, None)
         
         # Remove from page table
-        if process_id in self.page_table:
-            del self.page_table[process_id]
+        if process_id in page_table:
+            del page_table[process_id]
         
         # Update address to match the actual frame we deallocated
-        actual_address = frame_num * self.page_size
+        actual_address = frame_num * page_size
         
-        self.operations.append({
-            'type': 'deallocate',
-            'process_id': process_id,
-            'address': actual_address,
-            'frames': process_frames
-        })
+        self.operations.append(DeallocateRecord('deallocate', process_id, actual_address, process_frames))
         
-        logging.debug(f"Deallocated memory for process {process_id} from frames {process_frames}")
+        self.bump_version()
+        logger.debug("Deallocated memory for process %s from frames %s", process_id, process_frames)
     
     def access_memory(self, address):
         """
@@ -197,27 +231,32 @@ class MemoryManager:
         Returns:
             bool: True if page hit, False if page fault
         """
-        # Input validation
-        if address is None:
-            raise ValueError("Address cannot be None")
+        # Input validation, skipped for the usual int address
+        if type(address) is not int:
+            if address is None:
+                raise ValueError("Address cannot be None")
+            
+            try:
+                address = int(address)
+            except (ValueError, TypeError):
+                raise ValueError(f"Invalid address format: {address}")
         
-        try:
-            address = int(address)
-        except (ValueError, TypeError):
-            raise ValueError(f"Invalid address format: {address}")
+        total_frames = self.total_frames
         
         # Convert address to frame number
-        frame_num = address // self.page_size
+        page_shift = self.page_shift
+        frame_num = address >> page_shift if page_shift is not None else address // self.page_size
         
-        if frame_num >= len(self.memory) or frame_num < 0:
+        if frame_num >= total_frames or frame_num < 0:
             # Instead of raising error, choose a valid frame
-            logging.warning(f"Invalid address: {address}, choosing a valid frame instead")
-            frame_num = min(max(0, frame_num), len(self.memory) - 1)
+            logger.warning("Invalid address: %s, choosing a valid frame instead", address)
+            frame_num = min(max(0, frame_num), total_frames - 1)
         
         self.memory_accesses += 1
-        frame = self.memory[frame_num]
+        self.bump_version()
+        process_id = self.frame_id[frame_num]
         
-        if frame['status'] != 'allocated':
+        if process_id == FREE_FRAME:
             # Page fault
             self.page_faults += 1
             
@@ -225,34 +264,80 @@ class MemoryManager:
             try:
                 self._handle_page_fault(frame_num)
             except Exception as e:
-                logging.error(f"Error handling page fault: {e}")
+                logger.error("Error handling page fault: %s", e)
             
-            self.operations.append({
-                'type': 'access',
-                'address': address,
-                'result': 'fault'
-            })
+            self.operations.append(AccessRecord('access', address, 'fault'))
             
-            logging.debug(f"Page fault on address {address} (frame {frame_num})")
+            logger.debug("Page fault on address %s (frame %s)", address, frame_num)
             return False
         else:
             # Page hit
             self.page_hits += 1
-            process_id = frame['id']
             
-            # Update LRU data
-            if self.algorithm == 'LRU':
-                self.page_access_time[(process_id, frame_num)] = self.memory_accesses
+            # Update page replacement data structures
+            self._on_access_hit(frame_num)
             
-            self.operations.append({
-                'type': 'access',
-                'address': address,
-                'result': 'hit'
-            })
+            self.operations.append(AccessRecord('access', address, 'hit'))
             
-            logging.debug(f"Page hit on address {address} (frame {frame_num})")
+            logger.debug("Page hit on address %s (frame %s)", address, frame_num)
             return True
     
+    def first_allocated_address(self):
+        """
+        Get the address of the lowest allocated frame
+        
+        Returns:
+            int: Starting address of the frame, or None if no memory is allocated
+        """
+        if not self._allocated_frames:
+            return None
+        return self._allocated_frames[0] * self.page_size
+    
+    def deallocate_first_allocated(self):
+        """
+        Deallocate the process owning the lowest allocated frame
+        
+        Returns:
+            int: Starting address of the frame that was deallocated
+        
+        Raises:
+            NoAllocatedMemoryError: If no memory is allocated
+        """
+        address = self.first_allocated_address()
+        if address is None:
+            raise NoAllocatedMemoryError("No allocated memory to deallocate")
+        
+        self.deallocate_memory(address)
+        return address
+    
+    def bump_version(self):
+        """Mark the memory state as changed"""
+        self.version = next(_state_versions)
+    
+    def _track_allocated_frame(self, frame_idx):
+        """Add a newly allocated frame at the newest end of the replacement order"""
+        self._replacement_order[frame_idx] = None
+    
+    def _untracked_on_allocate(self, frame_idx):
+        """Unknown algorithms don't track frames for replacement"""
+    
+    def _lru_on_access_hit(self, frame_idx):
+        """Move an accessed frame to the most recently used end"""
+        self.page_access_time[frame_idx] = None
+        self.page_access_time.move_to_end(frame_idx)
+    
+    def _untracked_on_access_hit(self, frame_idx):
+        """Hits don't change the replacement order for FIFO or unknown algorithms"""
+    
+    def _release_frame(self, frame_idx):
+        """Mark a frame as free and keep the frame indexes in sync"""
+        if self.frame_id[frame_idx] == FREE_FRAME:
+            return
+        self.frame_id[frame_idx] = FREE_FRAME
+        self._memory_snapshot = None
+        self._allocated_frames.discard(frame_idx)
+        self._free_frames.add(frame_idx)
+    
     def _replace_pages(self, num_pages):
         """
         Replace pages according to the selected algorithm
@@ -263,88 +348,87 @@ class MemoryManager:
         try:
             # Input validation
             if num_pages <= 0:
-                logging.warning(f"Invalid number of pages to replace: {num_pages}")
+                logger.warning("Invalid number of pages to replace: %s", num_pages)
                 return
                 
+            # Bind attributes used on every pass of the loop
+            replacement_order = self._replacement_order
+            frame_id = self.frame_id
+            page_table = self.page_table
+            total_frames = self.total_frames
+            release_frame = self._release_frame
             for _ in range(num_pages):
                 # Default values in case algorithm-specific code fails
                 process_id = None
                 frame_idx = None
                 
                 try:
-                    if self.algorithm == 'FIFO':
-                        if not self.page_queue:
-                            # If no pages in queue, find any allocated frame
-                            allocated_frames = [(i, f['id']) for i, f in enumerate(self.memory) 
-                                               if f['status'] == 'allocated']
-                            
-                            if not allocated_frames:
-                                logging.warning("No allocated frames to replace with FIFO")
-                                break
-                                
-                            frame_idx, process_id = allocated_frames[0]
-                            logging.warning(f"Page queue empty, using first allocated frame {frame_idx}")
-                        else:
-                            # Normal FIFO operation
-                            process_id, frame_idx = self.page_queue.popleft()
-                        
-                    elif self.algorithm == 'LRU':
-                        if not self.page_access_time:
-                            # If no access times, find any allocated frame
-                            allocated_frames = [(i, f['id']) for i, f in enumerate(self.memory) 
-                                               if f['status'] == 'allocated']
-                            
-                            if not allocated_frames:
-                                logging.warning("No allocated frames to replace with LRU")
-                                break
-                                
-                            frame_idx, process_id = allocated_frames[0]
-                            logging.warning(f"Access time map empty, using first allocated frame {frame_idx}")
-                        else:
-                            # Normal LRU operation
-                            lru_key = min(self.page_access_time.items(), key=lambda x: x[1])[0]
-                            process_id, frame_idx = lru_key
-                            del self.page_access_time[lru_key]
+                    if replacement_order:
+                        # Normal FIFO/LRU operation
+                        frame_idx, _ = replacement_order.popitem(last=False)
+                        process_id = frame_id[frame_idx]
                     else:
-                        # Unknown algorithm fallback
-                        allocated_frames = [(i, f['id']) for i, f in enumerate(self.memory) 
-                                           if f['status'] == 'allocated']
-                        
-                        if not allocated_frames:
-                            logging.warning(f"Unknown algorithm {self.algorithm} and no allocated frames")
+                        # Nothing tracked, find any allocated frame
+                        victim = self._fallback_victim()
+                        if victim is None:
                             break
-                            
-                        frame_idx, process_id = allocated_frames[0]
-                        logging.warning(f"Unknown algorithm {self.algorithm}, using first allocated frame {frame_idx}")
+                        frame_idx, process_id = victim
                     
                     # Safety check for frame_idx and process_id
                     if frame_idx is None or process_id is None:
-                        logging.error("Failed to select a page for replacement")
+                        logger.error("Failed to select a page for replacement")
                         continue
                         
-                    if frame_idx >= len(self.memory) or frame_idx < 0:
-                        logging.error(f"Invalid frame index {frame_idx}")
+                    if frame_idx >= total_frames or frame_idx < 0:
+                        logger.error("Invalid frame index %s", frame_idx)
                         continue
                     
                     # Free the frame
-                    self.memory[frame_idx] = {'status': 'free', 'id': None}
+                    release_frame(frame_idx)
                     
                     # Update page table
-                    if process_id in self.page_table:
-                        self.page_table[process_id] = [f for f in self.page_table[process_id] if f != frame_idx]
-                        if not self.page_table[process_id]:
-                            del self.page_table[process_id]
+                    process_frames = page_table.get(process_id)
+                    if process_frames is not None:
+                        process_frames.discard(frame_idx)
+                        if not process_frames:
+                            del page_table[process_id]
                     
                     self.page_faults += 1
                     
-                    logging.debug(f"Replaced page in frame {frame_idx} for process {process_id} using {self.algorithm}")
+                    logger.debug("Replaced page in frame %s for process %s using %s", frame_idx, process_id, self.algorithm)
                     
                 except Exception as e:
-                    logging.error(f"Error replacing page: {e}")
+                    logger.error("Error replacing page: %s", e)
                     continue
                     
         except Exception as e:
-            logging.error(f"Error in page replacement: {e}")
+            logger.error("Error in page replacement: %s", e)
+    
+    def _fallback_victim(self):
+        """
+        Pick the first allocated frame when the algorithm has nothing to evict
+        
+        Returns:
+            tuple: (frame_idx, process_id), or None if no frame is allocated
+        """
+        if not self._allocated_frames:
+            if self.algorithm == 'FIFO':
+                logger.warning("No allocated frames to replace with FIFO")
+            elif self.algorithm == 'LRU':
+                logger.warning("No allocated frames to replace with LRU")
+            else:
+                logger.warning("Unknown algorithm %s and no allocated frames", self.algorithm)
+            return None
+        
+        frame_idx = self._allocated_frames[0]
+        process_id = self.frame_id[frame_idx]
+        if self.algorithm == 'FIFO':
+            logger.warning("Page queue empty, using first allocated frame %s", frame_idx)
+        elif self.algorithm == 'LRU':
+            logger.warning("Access time map empty, using first allocated frame %s", frame_idx)
+        else:
+            logger.warning("Unknown algorithm %s, using first allocated frame %s", self.algorithm, frame_idx)
+        return frame_idx, process_id
     
     def _handle_page_fault(self, frame_num):
         """
@@ -357,54 +441,63 @@ class MemoryManager:
         # For simulation, we'll just mark it as allocated
         
         # If the frame is already allocated, we don't need to do anything
-        if self.memory[frame_num]['status'] == 'allocated':
+        if self.frame_id[frame_num] != FREE_FRAME:
             return
         
-        # If the frame is free, allocate it
-        if self.memory[frame_num]['status'] == 'free':
-            process_id = self.next_id
-            self.next_id += 1
-            
-            self.memory[frame_num] = {
-                'status': 'allocated',
-                'id': process_id
-            }
-            
-            if process_id in self.page_table:
-                self.page_table[process_id].append(frame_num)
-            else:
-                self.page_table[process_id] = [frame_num]
-            
-            # Update page replacement data structures
-            if self.algorithm == 'FIFO':
-                self.page_queue.append((process_id, frame_num))
-            elif self.algorithm == 'LRU':
-                self.page_access_time[(process_id, frame_num)] = self.memory_accesses
-            
-            logging.debug(f"Handled page fault by allocating frame {frame_num} to process {process_id}")
+        # The frame is free, allocate it
+        process_id = self.next_id
+        self.next_id += 1
+        
+        self.frame_id[frame_num] = process_id
+        self._memory_snapshot = None
+        self._allocated_frames.add(frame_num)
+        self._free_frames.remove(frame_num)
+        
+        if process_id in self.page_table:
+            self.page_table[process_id].add(frame_num)
         else:
-            # This shouldn't happen
-            logging.error(f"Unexpected frame status in handle_page_fault: {self.memory[frame_num]['status']}")
+            self.page_table[process_id] = {frame_num}
+        
+        # Update page replacement data structures
+        self._on_allocate_frame(frame_num)
+        
+        logger.debug("Handled page fault by allocating frame %s to process %s", frame_num, process_id)
     
     def get_current_state(self):
         """
         Get the current memory state
         
         Returns:
-            dict: Current memory state
+            dict: Current memory state. The 'memory' list is shared between
+            calls until frame ownership changes and must not be modified.
         """
+        memory = self._memory_snapshot
+        if memory is None:
+            # Frames with the same owner share one entry dict, so building the
+            # frame list allocates one dict per process rather than per frame
+            entries = {FREE_FRAME: {'status': 'free', 'id': None}}
+            memory = []
+            for pid in self.frame_id:
+                entry = entries.get(pid)
+                if entry is None:
+                    entry = entries[pid] = {'status': 'allocated', 'id': pid}
+                memory.append(entry)
+            self._memory_snapshot = memory
+        
+        recent_operations = list(itertools.islice(reversed(self.operations), 10))
+        
         return {
             'technique': self.technique,
             'memory_size': self.memory_size,
             'page_size': self.page_size,
             'algorithm': self.algorithm,
             'total_frames': self.total_frames,
-            'memory': self.memory,
-            'page_table': self.page_table,
+            'memory': memory,
+            'page_table': {pid: sorted(frames) for pid, frames in self.page_table.items()},
             'page_faults': self.page_faults,
             'memory_accesses': self.memory_accesses,
             'page_hits': self.page_hits,
-            'operations': self.operations[-10:] if self.operations else []  # Return last 10 operations
+            'operations': [op._asdict() for op in reversed(recent_operations)]  # Return last 10 operations
         }
     
     def get_results(self):
@@ -417,7 +510,7 @@ class MemoryManager:
         hit_ratio = self.page_hits / max(1, self.memory_accesses) if self.memory_accesses > 0 else 0
         miss_ratio = self.page_faults / max(1, self.memory_accesses) if self.memory_accesses > 0 else 0
         
-        allocated_frames = sum(1 for frame in self.memory if frame['status'] == 'allocated')
+        allocated_frames = len(self._allocated_frames)
         utilization = allocated_frames / self.total_frames if self.total_frames > 0 else 0
         
         return {
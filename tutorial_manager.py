@@ -1,245 +1,315 @@
+import functools
+import hashlib
+import itertools
+import json
 import logging
+import marshal
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
+from enum import IntEnum
+from types import MappingProxyType
+from typing import Optional, Union
 """
 Tutorial manager for the Memory Management Visualizer
 Provides step-by-step guidance for memory optimization concepts
 """
 
+# Directory holding index.json and one steps file per tutorial
+TUTORIALS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tutorials')
+
+# File tutorial progress is saved to between runs; set MEMVIZ_TUTORIAL_STATE to
+# another path, or to an empty string to turn persistence off
+STATE_PATH = os.environ.get(
+    'MEMVIZ_TUTORIAL_STATE', os.path.join(os.path.expanduser('~'), '.memviz', 'tutorial_state.json')
+)
+
+class OpType(IntEnum):
+    """Operation types a tutorial step can expect; the lowercase name is the wire string"""
+    ALLOCATE = 0
+    ACCESS = 1
+    DEALLOCATE = 2
+    RESET = 3
+    
+    @property
+    def wire_name(self):
+        """Get the type as it appears in tutorial files and operation data"""
+        return _OP_TYPE_NAMES[self]
+
+_OP_TYPE_NAMES = {op_type: op_type.name.lower() for op_type in OpType}
+_OP_TYPES_BY_NAME = {name: op_type for op_type, name in _OP_TYPE_NAMES.items()}
+
+def _op_type(value):
+    """Translate an operation type string to OpType, or None if it isn't one"""
+    return _OP_TYPES_BY_NAME.get(value) if isinstance(value, str) else None
+
+@dataclass(frozen=True, slots=True)
+class Step:
+    """A single tutorial step, with its expected operation flattened into fields"""
+    title: str
+    content: str
+    task: str
+    # The type as written in the tutorial file if it isn't an OpType; no operation completes such a step
+    expected_type: Union[OpType, str, None] = None
+    expected_size: Optional[int] = None
+    expected_address: Optional[int] = None
+    config: dict = field(default_factory=dict)
+    is_first: bool = False  # Position within the tutorial, not part of the step's wire shape
+    is_last: bool = False
+    
+    @classmethod
+    def from_dict(cls, data, is_first=False, is_last=False):
+        """Build a step from its definition in a tutorial file"""
+        expected = data.get('expected_operation', {})
+        expected_type = expected.get('type')
+        op_type = _op_type(expected_type)
+        return cls(
+            title=data['title'],
+            content=data['content'],
+            task=data['task'],
+            expected_type=expected_type if op_type is None else op_type,
+            expected_size=expected.get('size'),
+            expected_address=expected.get('address'),
+            config=data.get('config', {}),
+            is_first=is_first,
+            is_last=is_last
+        )
+    
+    def to_dict(self):
+        """Get the step in the shape sent to the frontend"""
+        data = {'title': self.title, 'content': self.content, 'task': self.task}
+        if self.expected_type is not None:
+            expected_type = self.expected_type
+            expected = {'type': expected_type.wire_name if isinstance(expected_type, OpType) else expected_type}
+            if self.expected_size is not None:
+                expected['size'] = self.expected_size
+            if self.expected_address is not None:
+                expected['address'] = self.expected_address
+            data['expected_operation'] = expected
+        data['config'] = self.config
+        return data
+
+# Read-only error responses, shared instead of rebuilt on every call
+_ERR_NO_TUTORIAL = MappingProxyType({'error': True, 'message': 'No tutorial is currently active'})
+_ERR_FIRST_STEP = MappingProxyType({'error': True, 'message': 'Already at the first step'})
+
+@functools.lru_cache(maxsize=128)
+def _err_tutorial_not_found(tutorial_id):
+    """Get the read-only error response for an unknown tutorial ID"""
+    return MappingProxyType({'error': True, 'message': f'Tutorial with ID {tutorial_id} not found'})
+
+# Checks that an operation completes a step, by the step's expected operation type.
+# Allocate and access steps without an expected size/address are never completed
+# by an operation; any deallocate completes a deallocate step.
+# Each check receives the operation's type already translated to OpType, and
+# operation data whose size and address were already coerced to int upstream.
+_VERIFIERS = {
+    OpType.RESET: lambda step, op_type, operation_data: op_type is OpType.RESET,
+    OpType.ALLOCATE: lambda step, op_type, operation_data: (
+        op_type is OpType.ALLOCATE
+        and step.expected_size is not None
+        and operation_data.get('size') == step.expected_size
+    ),
+    OpType.ACCESS: lambda step, op_type, operation_data: (
+        op_type is OpType.ACCESS
+        and step.expected_address is not None
+        and operation_data.get('address') == step.expected_address
+    ),
+    OpType.DEALLOCATE: lambda step, op_type, operation_data: op_type is OpType.DEALLOCATE,
+}
+
+def _remove_temp_file(path):
+    """Delete a temporary file left by a failed write, if there is one"""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+def _read_tutorial_file(file_name):
+    """
+    Read a JSON file from TUTORIALS_DIR, through a marshal cache when possible
+    
+    The cache lives in TUTORIALS_DIR/__pycache__, is specific to the running
+    interpreter, and is rebuilt whenever the JSON file's size or mtime changes.
+    
+    Args:
+        file_name (str): Name of the JSON file
+        
+    Returns:
+        The parsed file contents
+    """
+    path = os.path.join(TUTORIALS_DIR, file_name)
+    source_stat = os.stat(path)
+    source_key = (source_stat.st_mtime_ns, source_stat.st_size)
+    
+    cache_path = None
+    if sys.implementation.cache_tag is not None:
+        cache_path = os.path.join(
+            TUTORIALS_DIR, '__pycache__', f'{file_name}.{sys.implementation.cache_tag}.marshal'
+        )
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_key, data = marshal.loads(f.read())
+            if cached_key == source_key:
+                return data
+        except (OSError, EOFError, ValueError, TypeError):
+            pass  # No usable cache, fall back to the JSON file
+    
+    with open(path, 'rb') as f:
+        data = json.loads(f.read())
+    
+    if cache_path is not None:
+        temp_path = f'{cache_path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(marshal.dumps((source_key, data)))
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            _remove_temp_file(temp_path)
+            logging.debug("Could not write tutorial cache %s: %s", cache_path, e)
+    
+    return data
+
+@functools.cache
+def _load_index():
+    """Read the tutorial index once per process, returning (metadata by ID, completion bit by ID, digest)"""
+    entries = _read_tutorial_file('index.json')
+    index = {entry['id']: entry for entry in entries}
+    bits = {tutorial_id: 1 << position for position, tutorial_id in enumerate(index)}
+    return index, bits, hashlib.blake2b(marshal.dumps(entries), digest_size=8).hexdigest()
+
+@functools.cache
+def _load_steps(tutorial_id):
+    """Read the steps of a tutorial once per process, as a tuple of Step"""
+    steps = _read_tutorial_file(f'{tutorial_id}.json')
+    last = len(steps) - 1
+    return tuple(
+        Step.from_dict(step, is_first=position == 0, is_last=position == last)
+        for position, step in enumerate(steps)
+    )
+
 class TutorialManager:
     """
     Manages tutorial sessions and guides users through memory optimization concepts
     """
     
-    def __init__(self):
-        """Initialize the tutorial manager with available tutorials"""
+    __slots__ = (
+        'current_tutorial', 'current_step', 'completed_mask',
+        '_active', '_step_responses', '_tutorial_list',
+        '_index', '_tutorial_bits', '_tutorials_digest',
+        '_state_path', '_state_versions', '_state_write_lock', '_written_state_version'
+    )
+    
+    def __init__(self, state_path=None):
+        """
+        Initialize the tutorial manager with available tutorials
+        
+        Args:
+            state_path (str): File to save progress to, STATE_PATH if None, or '' to not save it
+        """
         self.current_tutorial = None
         self.current_step = 0
-        self.completed_tutorials = set()
-        
-        # Define available tutorials
-        self.tutorials = {
-            'intro': {
-                'id': 'intro',
-                'title': 'Introduction to Memory Management',
-                'description': 'Learn the basics of memory allocation and management',
-                'steps': [
-                    {
-                        'title': 'Welcome to Memory Management',
-                        'content': 'In this tutorial, you will learn how memory is allocated and managed in computer systems.',
-                        'task': 'Click "Next" to continue.',
-                        'config': {
-                            'memory_size': 512,
-                            'page_size': 64,
-                            'technique': 'paging',
-                            'algorithm': 'FIFO'
-                        }
-                    },
-                    {
-                        'title': 'Memory Allocation',
-                        'content': 'Memory allocation is the process of assigning memory space for program data and instructions.',
-                        'task': 'Allocate 128 bytes of memory by entering "128" in the size field and clicking "Execute Operation".',
-                        'expected_operation': {'type': 'allocate', 'size': 128},
-                        'config': {}
-                    },
-                    {
-                        'title': 'Memory Access',
-                        'content': 'Programs access memory locations to read or modify data. Each access requires translating virtual addresses to physical memory locations.',
-                        'task': 'Access memory at address 64 by selecting "Access Memory" operation, entering "64", and clicking "Execute Operation".',
-                        'expected_operation': {'type': 'access', 'address': 64},
-                        'config': {}
-                    },
-                    {
-                        'title': 'Memory Deallocation',
-                        'content': 'When data is no longer needed, memory should be deallocated to be reused by other processes.',
-                        'task': 'Deallocate memory by selecting "Deallocate Memory" operation, entering the address shown, and clicking "Execute Operation".',
-                        'expected_operation': {'type': 'deallocate'},
-                        'config': {}
-                    },
-                    {
-                        'title': 'Introduction Complete',
-                        'content': 'Congratulations! You have completed the introduction to memory management.',
-                        'task': 'Click "Finish Tutorial" to return to the main interface.',
-                        'config': {}
-                    }
-                ]
-            },
-            'fragmentation': {
-                'id': 'fragmentation',
-                'title': 'Memory Fragmentation',
-                'description': 'Learn about internal and external memory fragmentation',
-                'steps': [
-                    {
-                        'title': 'Understanding Fragmentation',
-                        'content': 'Fragmentation occurs when memory is allocated and deallocated over time, leaving unused gaps.',
-                        'task': 'Click "Next" to continue.',
-                        'config': {
-                            'memory_size': 1024,
-                            'page_size': 128,
-                            'technique': 'segmentation',
-                            'algorithm': 'FIFO'
-                        }
-                    },
-                    {
-                        'title': 'External Fragmentation',
-                        'content': 'External fragmentation occurs when free memory is split into many small blocks that are not contiguous.',
-                        'task': 'Allocate 256 bytes of memory to see how memory blocks are assigned.',
-                        'expected_operation': {'type': 'allocate', 'size': 256},
-                        'config': {}
-                    },
-                    {
-                        'title': 'Creating Fragmentation',
-                        'content': 'Let\'s create some fragmentation by allocating and deallocating memory in a pattern.',
-                        'task': 'Allocate another 128 bytes of memory.',
-                        'expected_operation': {'type': 'allocate', 'size': 128},
-                        'config': {}
-                    },
-                    {
-                        'title': 'Deallocating Memory',
-                        'content': 'Now we\'ll deallocate the first block we allocated, creating a "hole" in memory.',
-                        'task': 'Deallocate the first memory block by selecting "Deallocate Memory" and using the address shown.',
-                        'expected_operation': {'type': 'deallocate'},
-                        'config': {}
-                    },
-                    {
-                        'title': 'Observing Fragmentation',
-                        'content': 'Notice how the memory now has gaps. This is external fragmentation.',
-                        'task': 'Try to allocate 192 bytes and observe how the memory is assigned.',
-                        'expected_operation': {'type': 'allocate', 'size': 192},
-                        'config': {}
-                    },
-                    {
-                        'title': 'Internal Fragmentation',
-                        'content': 'Internal fragmentation occurs when allocated memory is larger than what is needed, wasting space within allocated blocks.',
-                        'task': 'Allocate 60 bytes and observe how a full page/segment is allocated despite needing less.',
-                        'expected_operation': {'type': 'allocate', 'size': 60},
-                        'config': {}
-                    },
-                    {
-                        'title': 'Fragmentation Complete',
-                        'content': 'You\'ve learned about both external and internal fragmentation in memory systems.',
-                        'task': 'Click "Finish Tutorial" to return to the main interface.',
-                        'config': {}
-                    }
-                ]
-            },
-            'page_replacement': {
-                'id': 'page_replacement',
-                'title': 'Page Replacement Algorithms',
-                'description': 'Compare different page replacement strategies',
-                'steps': [
-                    {
-                        'title': 'Page Replacement',
-                        'content': 'When memory is full, page replacement algorithms decide which pages to remove to make space for new ones.',
-                        'task': 'Click "Next" to learn about different algorithms.',
-                        'config': {
-                            'memory_size': 512,
-                            'page_size': 64,
-                            'technique': 'paging',
-                            'algorithm': 'FIFO'
-                        }
-                    },
-                    {
-                        'title': 'First-In-First-Out (FIFO)',
-                        'content': 'FIFO replaces the oldest page in memory, regardless of how frequently it\'s used.',
-                        'task': 'Fill memory by allocating 512 bytes.',
-                        'expected_operation': {'type': 'allocate', 'size': 512},
-                        'config': {'algorithm': 'FIFO'}
-                    },
-                    {
-                        'title': 'FIFO Page Fault',
-                        'content': 'Now that memory is full, let\'s see how FIFO handles a new allocation.',
-                        'task': 'Allocate 128 more bytes and observe which pages are replaced.',
-                        'expected_operation': {'type': 'allocate', 'size': 128},
-                        'config': {}
-                    },
-                    {
-                        'title': 'Least Recently Used (LRU)',
-                        'content': 'LRU replaces the page that hasn\'t been accessed for the longest time.',
-                        'task': 'Click "Reset Simulation" and then start a new simulation with LRU algorithm.',
-                        'expected_operation': {'type': 'reset'},
-                        'config': {'algorithm': 'LRU'}
-                    },
-                    {
-                        'title': 'LRU Memory Access',
-                        'content': 'LRU tracks page access history to make replacement decisions.',
-                        'task': 'Allocate 256 bytes of memory, then access the first page at address 0.',
-                        'expected_operation': {'type': 'allocate', 'size': 256},
-                        'config': {}
-                    },
-                    {
-                        'title': 'LRU Page Replacement',
-                        'content': 'Now let\'s fill memory and see which pages LRU chooses to replace.',
-                        'task': 'Allocate 384 more bytes and observe the replacement pattern.',
-                        'expected_operation': {'type': 'allocate', 'size': 384},
-                        'config': {}
-                    },
-                    {
-                        'title': 'Algorithm Comparison',
-                        'content': 'Different algorithms perform better in different scenarios. The best choice depends on memory access patterns.',
-                        'task': 'Click "Finish Tutorial" to return to the main interface.',
-                        'config': {}
-                    }
-                ]
-            },
-            'optimization': {
-                'id': 'optimization',
-                'title': 'Memory Optimization Techniques',
-                'description': 'Learn practical techniques to optimize memory usage',
-                'steps': [
-                    {
-                        'title': 'Memory Optimization',
-                        'content': 'Memory optimization aims to reduce memory usage while maintaining performance.',
-                        'task': 'Click "Next" to continue.',
-                        'config': {
-                            'memory_size': 1024,
-                            'page_size': 64,
-                            'technique': 'paging',
-                            'algorithm': 'LRU'
-                        }
-                    },
-                    {
-                        'title': 'Right-Sizing Allocations',
-                        'content': 'One optimization technique is to allocate exactly what you need, reducing internal fragmentation.',
-                        'task': 'Allocate 60 bytes and notice the internal fragmentation within the page.',
-                        'expected_operation': {'type': 'allocate', 'size': 60},
-                        'config': {}
-                    },
-                    {
-                        'title': 'Memory Pooling',
-                        'content': 'Memory pooling involves pre-allocating fixed-size blocks for frequent allocations.',
-                        'task': 'Allocate four 64-byte blocks to simulate a memory pool.',
-                        'expected_operation': {'type': 'allocate', 'size': 64},
-                        'config': {}
-                    },
-                    {
-                        'title': 'Locality of Reference',
-                        'content': 'Programs with good locality of reference (accessing nearby memory addresses) perform better.',
-                        'task': 'Access memory addresses 0, 4, 8, and 12 in sequence to demonstrate spatial locality.',
-                        'expected_operation': {'type': 'access', 'address': 0},
-                        'config': {}
-                    },
-                    {
-                        'title': 'Compaction',
-                        'content': 'Memory compaction rearranges allocated blocks to eliminate external fragmentation.',
-                        'task': 'Allocate and deallocate memory to create fragmentation, then observe the compaction process.',
-                        'expected_operation': {'type': 'deallocate'},
-                        'config': {}
-                    },
-                    {
-                        'title': 'Optimization Challenge',
-                        'content': 'Now, try to allocate memory efficiently to achieve at least a 75% utilization rate.',
-                        'task': 'Allocate memory in an optimal pattern to reach the target utilization.',
-                        'expected_operation': {'type': 'allocate'},
-                        'config': {}
-                    },
-                    {
-                        'title': 'Optimization Complete',
-                        'content': 'Congratulations! You\'ve learned several memory optimization techniques.',
-                        'task': 'Click "Finish Tutorial" to return to the main interface.',
-                        'config': {}
-                    }
-                ]
-            }
+        self.completed_mask = 0  # One bit per completed tutorial, see _tutorial_bits
+        
+        # (steps, number of steps, title) of the current tutorial, or None
+        self._active = None
+        
+        # get_current_step responses by (tutorial_id, step index)
+        self._step_responses = {}
+        
+        # get_tutorial_list result, None until built or after a completion changes
+        self._tutorial_list = None
+        
+        # Tutorial metadata (id, title, description) by ID, in display order,
+        # each tutorial's completion bit (by index position), and a fingerprint
+        # of the index used to tag tutorial list responses. All are shared by
+        # all instances; steps are loaded per tutorial on first use.
+        self._index, self._tutorial_bits, self._tutorials_digest = _load_index()
+        
+        # Progress is written in the background; snapshots are numbered so an
+        # older one never overwrites a newer one
+        self._state_path = STATE_PATH if state_path is None else state_path
+        self._state_versions = itertools.count(1)
+        self._state_write_lock = threading.Lock()
+        self._written_state_version = 0
+        self._restore_state()
+    
+    def _activate(self, tutorial_id, step_index=0):
+        """Make a tutorial the current one, at the given step"""
+        steps = _load_steps(tutorial_id)
+        self.current_tutorial = tutorial_id
+        self.current_step = step_index
+        self._active = (steps, len(steps), self._index[tutorial_id]['title'])
+    
+    def _restore_state(self):
+        """Restore progress saved by a previous run, keeping the defaults if there is none"""
+        if not self._state_path:
+            return
+        
+        try:
+            with open(self._state_path, 'rb') as f:
+                state = json.loads(f.read())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logging.warning("Ignoring unreadable tutorial state file %s: %s", self._state_path, e)
+            return
+        
+        if not isinstance(state, dict):
+            logging.warning("Ignoring malformed tutorial state file %s", self._state_path)
+            return
+        
+        completed = state.get('completed_tutorials')
+        if isinstance(completed, list):
+            for tutorial_id in completed:
+                if isinstance(tutorial_id, str):
+                    self.completed_mask |= self._tutorial_bits.get(tutorial_id, 0)
+        
+        tutorial_id = state.get('current_tutorial')
+        step_index = state.get('current_step')
+        if isinstance(tutorial_id, str) and tutorial_id in self._index and type(step_index) is int:
+            if 0 <= step_index < len(_load_steps(tutorial_id)):
+                self._activate(tutorial_id, step_index)
+    
+    def _persist(self):
+        """Save progress to the state file in the background"""
+        if not self._state_path:
+            return
+        
+        completed_mask = self.completed_mask
+        state = {
+            'completed_tutorials': [
+                tutorial_id for tutorial_id, bit in self._tutorial_bits.items() if completed_mask & bit
+            ],
+            'current_tutorial': self.current_tutorial,
+            'current_step': self.current_step
         }
+        version = next(self._state_versions)
+        threading.Thread(target=self._write_state, args=(state, version), daemon=True).start()
+    
+    def _write_state(self, state, version):
+        """Write a progress snapshot, unless a newer one has already been written"""
+        with self._state_write_lock:
+            if version <= self._written_state_version:
+                return
+            
+            # Unique per process, manager and snapshot: other writers may share the state file
+            temp_path = f'{self._state_path}.{os.getpid()}.{id(self):x}.{version}.tmp'
+            try:
+                directory = os.path.dirname(self._state_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(state, f)
+                os.replace(temp_path, self._state_path)
+            except OSError as e:
+                _remove_temp_file(temp_path)
+                logging.warning("Could not save tutorial state to %s: %s", self._state_path, e)
+                return
+            
+            self._written_state_version = version
     
     def start_tutorial(self, tutorial_id):
         """
@@ -251,45 +321,61 @@ class TutorialManager:
         Returns:
             dict: First step of the tutorial or error message
         """
-        if tutorial_id not in self.tutorials:
-            return {
-                'error': True,
-                'message': f'Tutorial with ID {tutorial_id} not found'
-            }
+        if tutorial_id not in self._index:
+            return _err_tutorial_not_found(tutorial_id)
         
-        self.current_tutorial = tutorial_id
-        self.current_step = 0
+        self._activate(tutorial_id)
+        self._persist()
         logging.info(f"Started tutorial: {tutorial_id}")
         
         return self.get_current_step()
     
-    def next_step(self):
+    def _advance(self, delta):
         """
-        Advance to the next step in the current tutorial
+        Move delta steps through the current tutorial
         
+        Args:
+            delta (int): Number of steps to move, negative to go back
+            
         Returns:
-            dict: Next step information or completion message
+            dict: New step information, completion message or error message
         """
         if not self.current_tutorial:
-            return {
-                'error': True,
-                'message': 'No tutorial is currently active'
-            }
+            return _ERR_NO_TUTORIAL
+        
+        new_step = self.current_step + delta
         
-        tutorial = self.tutorials[self.current_tutorial]
+        if new_step < 0:
+            return _ERR_FIRST_STEP
         
-        if self.current_step >= len(tutorial['steps']) - 1:
+        _, num_steps, title = self._active
+        
+        if new_step >= num_steps:
             # Tutorial completed
-            self.completed_tutorials.add(self.current_tutorial)
+            completed_mask = self.completed_mask | self._tutorial_bits[self.current_tutorial]
+            if completed_mask != self.completed_mask:
+                self.completed_mask = completed_mask
+                self._tutorial_list = None
+                self._persist()
             return {
                 'completed': True,
-                'message': f'Tutorial "{tutorial["title"]}" completed!',
+                'message': f'Tutorial "{title}" completed!',
                 'tutorial': self.current_tutorial
             }
         
-        self.current_step += 1
+        self.current_step = new_step
+        self._persist()
         return self.get_current_step()
     
+    def next_step(self):
+        """
+        Advance to the next step in the current tutorial
+        
+        Returns:
+            dict: Next step information or completion message
+        """
+        return self._advance(1)
+    
     def previous_step(self):
         """
         Go back to the previous step in the current tutorial
@@ -297,55 +383,45 @@ class TutorialManager:
         Returns:
             dict: Previous step information
         """
-        if not self.current_tutorial:
-            return {
-                'error': True,
-                'message': 'No tutorial is currently active'
-            }
-        
-        if self.current_step <= 0:
-            return {
-                'error': True,
-                'message': 'Already at the first step'
-            }
-        
-        self.current_step -= 1
-        return self.get_current_step()
+        return self._advance(-1)
     
     def get_current_step(self):
         """
         Get the current tutorial step
         
         Returns:
-            dict: Current step information
+            dict: Current step information, shared between calls and not to be modified
         """
 
         if not self.current_tutorial:
-            return {
-                'error': True,
-                'message': 'No tutorial is currently active'
-            }
+            return _ERR_NO_TUTORIAL
         
-        tutorial = self.tutorials[self.current_tutorial]
-        step = tutorial['steps'][self.current_step]
+        key = (self.current_tutorial, self.current_step)
+        response = self._step_responses.get(key)
+        if response is not None:
+            return response
         
-        return {
+        steps, num_steps, title = self._active
+        step = steps[self.current_step]
+        
+        response = self._step_responses[key] = {
             'error': False,
             'tutorial_id': self.current_tutorial,
-            'tutorial_title': tutorial['title'],
+            'tutorial_title': title,
             'step_index': self.current_step,
-            'total_steps': len(tutorial['steps']),
-            'step': step,
-            'is_last_step': self.current_step == len(tutorial['steps']) - 1,
-            'is_first_step': self.current_step == 0
+            'total_steps': num_steps,
+            'step': step.to_dict(),
+            'is_last_step': step.is_last,
+            'is_first_step': step.is_first
         }
+        return response
     
     def verify_step_completed(self, operation_data):
         """
         Verify if a user operation completes the current tutorial step
         
         Args:
-            operation_data (dict): Data about the operation performed
+            operation_data (dict): Data about the operation performed, with int size and address
             
         Returns:
             bool: True if the operation completes the step
@@ -353,55 +429,54 @@ class TutorialManager:
         if not self.current_tutorial:
             return False
         
-        step = self.tutorials[self.current_tutorial]['steps'][self.current_step]
+        step = self._active[0][self.current_step]
+        
+        expected_type = step.expected_type
         
         # If no expected operation, any operation is fine
-        if 'expected_operation' not in step:
+        if expected_type is None:
             return True
         
-        expected = step['expected_operation']
-        
-        # If expected type is reset, we need to check differently
-        if expected.get('type') == 'reset':
-            return operation_data.get('type') == 'reset'
-        
-        # Check if operation matches expected
-        if expected.get('type') != operation_data.get('type'):
+        # No operation completes a step whose expected type isn't recognised
+        if not isinstance(expected_type, OpType):
             return False
-            
-        # For allocate operations, check size
-        if expected.get('type') == 'allocate' and 'size' in expected:
-            return int(operation_data.get('size', 0)) == int(expected['size'])
-            
-        # For access operations, check address
-        if expected.get('type') == 'access' and 'address' in expected:
-            return int(operation_data.get('address', -1)) == int(expected['address'])
-            
-        # For deallocate operations, we're more flexible (any deallocate works)
-        if expected.get('type') == 'deallocate':
-            return True
-            
-        return False
+        
+        return _VERIFIERS[expected_type](step, _op_type(operation_data.get('type')), operation_data)
     
     def get_tutorial_list(self):
         """
         Get list of available tutorials with completion status
         
         Returns:
-            list: List of tutorial information
+            list: List of tutorial information, shared between calls and not to be modified
         """
+        if self._tutorial_list is not None:
+            return self._tutorial_list
+        
         result = []
+        completed_mask = self.completed_mask
+        tutorial_bits = self._tutorial_bits
         
-        for tutorial_id, tutorial in self.tutorials.items():
+        for tutorial_id, tutorial in self._index.items():
             result.append({
                 'id': tutorial_id,
                 'title': tutorial['title'],
                 'description': tutorial['description'],
-                'completed': tutorial_id in self.completed_tutorials
+                'completed': bool(completed_mask & tutorial_bits[tutorial_id])
             })
-            
+        
+        self._tutorial_list = result
         return result
     
+    def get_tutorial_list_etag(self):
+        """
+        Get an entity tag for the tutorial list
+        
+        Returns:
+            str: Tag that changes whenever get_tutorial_list() would return different data
+        """
+        return f'{self._tutorials_digest}-{self.completed_mask:x}'
+    
     def end_tutorial(self):
         """
         End the current tutorial
@@ -410,14 +485,13 @@ class TutorialManager:
             dict: Status message
         """
         if not self.current_tutorial:
-            return {
-                'error': True,
-                'message': 'No tutorial is currently active'
-            }
+            return _ERR_NO_TUTORIAL
         
         tutorial_id = self.current_tutorial
         self.current_tutorial = None
         self.current_step = 0
+        self._active = None
+        self._persist()
         logging.info(f"Ended tutorial: {tutorial_id}")
         
         return {